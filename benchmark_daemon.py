@@ -0,0 +1,126 @@
+"""
+Measure end-to-end check/out step latency with and without the resource daemon.
+
+    python benchmark_daemon.py --steps 20
+
+Every step is a fresh Python process, as Concourse runs them, talking to a local
+GitHub stub (see github_stub.py). In "in-process" mode each step authenticates and
+connects from scratch; in "daemon" mode the step forwards its payload to a
+`python concourse.py daemon` process that keeps its resources warm. Results are
+printed as JSON with p50/mean/max latency in milliseconds per step type.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from concourse import DAEMON_SOCKET_ENV_VAR
+from github_stub import GithubStub
+
+HERE = Path(__file__).resolve().parent
+STEP_SCRIPT = (
+    "import sys; sys.path.insert(0, {here!r}); "
+    "from concourse import ConcourseGithubIssuesResource; "
+    "ConcourseGithubIssuesResource.{method}()"
+)
+BUILD_ENV = {
+    "BUILD_ID": "1",
+    "BUILD_TEAM_NAME": "main",
+    "BUILD_JOB_NAME": "deploy",
+    "BUILD_PIPELINE_NAME": "benchmark",
+    "ATC_EXTERNAL_URL": "http://concourse.example.com",
+}
+
+
+def run_step(
+    method: str, payload: dict[str, Any], args: list[str], env: dict[str, str]
+) -> float:
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", STEP_SCRIPT.format(here=str(HERE), method=method)]
+        + args,
+        input=json.dumps(payload),
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return (time.perf_counter() - started) * 1000
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    return {
+        "p50_ms": round(statistics.median(latencies), 1),
+        "mean_ms": round(statistics.fmean(latencies), 1),
+        "max_ms": round(max(latencies), 1),
+    }
+
+
+def run_mode(mode: str, stub: GithubStub, steps: int, work_dir: str) -> dict[str, Any]:
+    source = {
+        "repository": "bench/repo",
+        "access_token": "dummy_token",
+        "gh_host": stub.url,
+        "issue_state": "open",
+    }
+    env = {**os.environ, **BUILD_ENV}
+    env.pop(DAEMON_SOCKET_ENV_VAR, None)
+    daemon = None
+    if mode == "daemon":
+        socket_path = os.path.join(work_dir, "daemon.sock")
+        env[DAEMON_SOCKET_ENV_VAR] = socket_path
+        daemon = subprocess.Popen(
+            [sys.executable, str(HERE / "concourse.py"), "daemon", socket_path],
+            stdout=subprocess.DEVNULL,
+        )
+        while not os.path.exists(socket_path):
+            time.sleep(0.01)
+
+    check_latencies, out_latencies = [], []
+    try:
+        for build in range(1, steps + 1):
+            env["BUILD_NAME"] = str(build)
+            check_latencies.append(run_step("check_main", {"source": source}, [], env))
+            out_latencies.append(
+                run_step("out_main", {"source": source, "params": {}}, [work_dir], env)
+            )
+    finally:
+        if daemon is not None:
+            daemon.terminate()
+            daemon.wait()
+    return {
+        "mode": mode,
+        "steps": steps,
+        "check": summarize(check_latencies),
+        "out": summarize(out_latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=20)
+    args = parser.parse_args()
+
+    results = []
+    for mode in ("in-process", "daemon"):
+        stub = GithubStub()
+        stub.start()
+        try:
+            with tempfile.TemporaryDirectory() as work_dir:
+                result = run_mode(mode, stub, args.steps, work_dir)
+        finally:
+            stub.stop()
+        result["stub_requests"] = stub.request_count
+        results.append(result)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Compare CPU time and peak RSS of the two issue listing paths used by `check`.
+
+    python benchmark_issue_listing.py --issues 10000 --match-ratio 0.1
+
+Each path runs in its own subprocess so peak RSS is not shared between them.
+Synthetic pages shaped like the GitHub issues listing (including the nested
+user, labels and milestone objects) are generated up front and decoded either
+into PyGithub Issue objects, as `get_matching_issues` does, or into
+`IssueRecord`s through `decode_issue_page`. Results are printed as JSON,
+normalised per 10k issues.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING, Any
+
+from concourse import IssueRecord, compile_title_pattern, decode_issue_page
+
+if TYPE_CHECKING:
+    from github.Issue import Issue
+
+PAGE_SIZE = 100
+ISSUE_PREFIX = "[bot]"
+TITLE_PATTERN = compile_title_pattern(ISSUE_PREFIX)
+
+
+def synthetic_issue(number: int, matching: bool) -> dict[str, Any]:
+    user = {
+        "login": "ol-bot",
+        "id": 1,
+        "node_id": "MDQ6VXNlcjE=",
+        "avatar_url": "https://avatars.githubusercontent.com/u/1?v=4",
+        "url": "https://api.github.com/users/ol-bot",
+        "html_url": "https://github.com/ol-bot",
+        "type": "Bot",
+        "site_admin": False,
+    }
+    title_prefix = ISSUE_PREFIX if matching else "User"
+    return {
+        "url": f"https://api.github.com/repos/test/repo/issues/{number}",
+        "html_url": f"https://github.com/test/repo/issues/{number}",
+        "id": 1000000 + number,
+        "node_id": f"I_kwDO{number:08d}",
+        "number": number,
+        "title": f"{title_prefix} Pipeline pipeline-{number % 50} task deploy completed",
+        "user": user,
+        "labels": [
+            {
+                "id": 42,
+                "name": "product:infrastructure",
+                "color": "ededed",
+                "default": False,
+                "url": "https://api.github.com/repos/test/repo/labels/product",
+            }
+        ],
+        "state": "closed",
+        "locked": False,
+        "assignee": user,
+        "assignees": [user],
+        "milestone": {
+            "url": "https://api.github.com/repos/test/repo/milestones/1",
+            "number": 1,
+            "title": "v1",
+            "state": "open",
+            "creator": user,
+        },
+        "comments": number % 7,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-02T00:00:00Z",
+        "closed_at": "2024-01-02T00:00:00Z",
+        "author_association": "NONE",
+        "body": "The task deploy in pipeline has completed build number 1.\n" * 4,
+        "reactions": {"url": "", "total_count": 0, "+1": 0, "-1": 0},
+    }
+
+
+def synthetic_pages(issue_count: int, match_ratio: float) -> list[str]:
+    match_every = max(1, round(1 / match_ratio)) if match_ratio else 0
+    # Built page by page so the decoded dicts do not inflate the baseline RSS
+    return [
+        json.dumps(
+            [
+                synthetic_issue(number, bool(match_every) and number % match_every == 0)
+                for number in range(last, max(last - PAGE_SIZE, 0), -1)
+            ]
+        )
+        for last in range(issue_count, 0, -PAGE_SIZE)
+    ]
+
+
+def run_pygithub(pages: list[str]) -> list["Issue"]:
+    from github import Github
+    from github.Issue import Issue
+
+    requester = Github(per_page=PAGE_SIZE).requester
+    matched: list[Issue] = []
+    for page in pages:
+        for attributes in json.loads(page):
+            issue = Issue(requester, {}, attributes, completed=True)
+            if issue.title.startswith(ISSUE_PREFIX):
+                issue.created_at.strftime("%Y-%m-%dT%H:%M:%S")
+                issue.closed_at.strftime("%Y-%m-%dT%H:%M:%S")
+                matched.append(issue)
+    return matched
+
+
+def run_raw(pages: list[str]) -> list[IssueRecord]:
+    matched: list[IssueRecord] = []
+    for page in pages:
+        matched.extend(decode_issue_page(page, TITLE_PATTERN))
+    return matched
+
+
+def measure(mode: str, issue_count: int, match_ratio: float) -> dict[str, Any]:
+    pages = synthetic_pages(issue_count, match_ratio)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    cpu_before = time.process_time()
+    matched = run_raw(pages) if mode == "raw" else run_pygithub(pages)
+    cpu_seconds = time.process_time() - cpu_before
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    scale = 10000 / issue_count
+    return {
+        "mode": mode,
+        "issues": issue_count,
+        "matched": len(matched),
+        "cpu_seconds_per_10k": round(cpu_seconds * scale, 4),
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_kib": rss_after,
+        "peak_rss_growth_kib_per_10k": round((rss_after - rss_before) * scale),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--issues", type=int, default=10000)
+    parser.add_argument("--match-ratio", type=float, default=0.1)
+    parser.add_argument("--mode", choices=["pygithub", "raw"])
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.issues, args.match_ratio)))
+        return
+
+    results = []
+    for mode in ("pygithub", "raw"):
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--mode",
+                mode,
+                "--issues",
+                str(args.issues),
+                "--match-ratio",
+                str(args.match_ratio),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
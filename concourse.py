@@ -9,19 +9,148 @@ resources:
 
 """
 from pathlib import Path
+import cProfile
+import collections
+import contextlib
+import functools
+import hashlib
+import inspect
+import io
+import itertools
+import os
+import pstats
+import re
+import socket
+import socketserver
+import string
+import tempfile
 import textwrap
+import threading
+import time
+import tracemalloc
 import json
 import sys
-from datetime import datetime, timedelta
-from typing import Literal, Optional, Tuple
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Concatenate,
+    Iterator,
+    Literal,
+    NamedTuple,
+    Optional,
+    ParamSpec,
+    Pattern,
+    Tuple,
+    TypeVar,
+)
 from concoursetools import BuildMetadata, ConcourseResource
 from concoursetools.version import Version, SortableVersionMixin
 from github import Github, Auth, Consts, GithubException
 from github.GithubObject import NotSet
 from github.Issue import Issue
 
+try:
+    # orjson is optional; it is only used to speed up decoding of raw issue pages
+    import orjson
+
+    json_loads: Callable[[str], Any] = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 ISO_8601_FORMAT = "%Y-%m-%dT%H:%M:%S"
 
+# Hidden markers used by the "rolling" comment mode. The issue body carries the id
+# of the bot-owned status comment so it can be fetched directly on later puts, and
+# the status comment carries its own bookkeeping so no comment listing is needed.
+STATUS_COMMENT_ID_MARKER = "<!-- concourse-github-issues:status-comment-id={} -->"
+STATUS_COMMENT_ID_PATTERN = re.compile(
+    r"<!-- concourse-github-issues:status-comment-id=(\d+) -->"
+)
+STATUS_COMMENT_STATE_MARKER = (
+    "<!-- concourse-github-issues:status-comment builds_since_append={} -->"
+)
+STATUS_COMMENT_STATE_PATTERN = re.compile(
+    r"<!-- concourse-github-issues:status-comment builds_since_append=(\d+) -->"
+)
+STATUS_HISTORY_HEADER = "| Build | Job | Build log |\n|---|---|---|"
+
+# Profiling can be switched on from the source config or, without touching the
+# pipeline, from the environment of the resource container.
+PROFILE_ENV_VAR = "CONCOURSE_GITHUB_ISSUES_PROFILE"
+PROFILE_DIR_ENV_VAR = "CONCOURSE_GITHUB_ISSUES_PROFILE_DIR"
+
+# When this points at the socket of a running daemon (see serve_daemon), the
+# check/in/out scripts forward their payload to it instead of running in-process.
+DAEMON_SOCKET_ENV_VAR = "CONCOURSE_GITHUB_ISSUES_DAEMON_SOCKET"
+DAEMON_STEP_METHODS = {"check": "check_main", "in": "in_main", "out": "out_main"}
+# Seconds a forwarded step may take, including time queued behind other steps,
+# before it fails
+DAEMON_TIMEOUT_ENV_VAR = "CONCOURSE_GITHUB_ISSUES_DAEMON_TIMEOUT"
+DAEMON_DEFAULT_TIMEOUT = 600.0
+# Environment forwarded to the daemon so it can rebuild the step's BuildMetadata
+DAEMON_FORWARDED_ENV_VARS = (
+    "BUILD_ID",
+    "BUILD_TEAM_NAME",
+    "BUILD_NAME",
+    "BUILD_JOB_NAME",
+    "BUILD_PIPELINE_NAME",
+    "BUILD_PIPELINE_INSTANCE_VARS",
+    "BUILD_CREATED_BY",
+    "ATC_EXTERNAL_URL",
+    PROFILE_ENV_VAR,
+    PROFILE_DIR_ENV_VAR,
+)
+
+# GitHub's search API returns at most this many results for a single query
+SEARCH_RESULT_LIMIT = 1000
+# Authenticated search requests allowed per rolling minute
+SEARCH_REQUESTS_PER_MINUTE = 30
+SEARCH_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Matches the rel="next" entry of a GitHub pagination Link header
+NEXT_PAGE_PATTERN = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+# Ordered (category, substrings) pairs matched against "filename:function" of each
+# profiled function. Builtins such as socket reads only carry a function name.
+PROFILE_CATEGORIES: list[Tuple[str, Tuple[str, ...]]] = [
+    (
+        "network",
+        (
+            "_ssl.",
+            "/ssl.py",
+            "socket",
+            "select",
+            "/http/client.py",
+            "/urllib3/",
+            "/requests/",
+        ),
+    ),
+    ("json_decode", ("/json/", "_json")),
+    ("pygithub", ("/github/",)),
+    ("resource", ("concourse.py",)),
+]
+
+P = ParamSpec("P")
+R = TypeVar("R")
+ResourceT = TypeVar("ResourceT", bound="ConcourseGithubIssuesResource")
+
+
+# Placeholders available to the issue title and body templates
+BUILD_METADATA_FIELDS = (
+    "BUILD_URL",
+    "BUILD_ID",
+    "BUILD_TEAM_NAME",
+    "BUILD_NAME",
+    "BUILD_JOB_NAME",
+    "BUILD_PIPELINE_NAME",
+    "BUILD_PIPELINE_INSTANCE_VARS",
+    "ATC_EXTERNAL_URL",
+)
+
 
 def build_metadata_dict(build_metadata: BuildMetadata) -> dict[str, str]:
     return dict(
@@ -36,6 +165,225 @@ def build_metadata_dict(build_metadata: BuildMetadata) -> dict[str, str]:
     )
 
 
+class CompiledTemplate:
+    """A ``str.format`` template parsed once, with a matching reverse parser.
+
+    Unknown placeholders are rejected when the template is compiled rather than
+    when it is first rendered. ``pattern`` is a regex that fully matches any
+    string the template can render, capturing each placeholder by name.
+    """
+
+    def __init__(self, template: str, fields: Collection[str] = BUILD_METADATA_FIELDS):
+        self.template = template
+        self.pieces: list[Tuple[str, Optional[str]]] = []
+        # Attribute/index access, conversions and format specs fall back to format()
+        self.simple = True
+        regex_parts = []
+        seen_fields: set[str] = set()
+        unknown_fields = []
+        for literal, field, format_spec, conversion in string.Formatter().parse(
+            template
+        ):
+            regex_parts.append(re.escape(literal))
+            if field is None:
+                self.pieces.append((literal, None))
+                continue
+            root_field = re.split(r"[.\[]", field, maxsplit=1)[0]
+            if root_field not in fields:
+                unknown_fields.append(field or "<positional>")
+                continue
+            self.pieces.append((literal, root_field))
+            if root_field != field or format_spec or conversion:
+                self.simple = False
+                regex_parts.append("(?:.*?)")
+            elif root_field in seen_fields:
+                regex_parts.append(f"(?P={root_field})")
+            else:
+                seen_fields.add(root_field)
+                regex_parts.append(f"(?P<{root_field}>.*?)")
+        if unknown_fields:
+            raise ValueError(
+                f"Unknown placeholders {unknown_fields} in template {template!r}. "
+                f"Available placeholders are {sorted(fields)}"
+            )
+        self.pattern: Pattern[str] = re.compile("".join(regex_parts) + r"\Z", re.DOTALL)
+
+    def render(self, values: dict[str, str]) -> str:
+        if not self.simple:
+            return self.template.format(**values)
+        return "".join(
+            literal if field is None else f"{literal}{values[field]}"
+            for literal, field in self.pieces
+        )
+
+    def parse(self, rendered: str) -> Optional[dict[str, str]]:
+        """Recover the placeholder values from a rendered string, if it matches."""
+        match = self.pattern.match(rendered)
+        return match.groupdict() if match else None
+
+
+def compile_title_pattern(
+    issue_prefix: Optional[str] = None,
+    title_template: Optional[CompiledTemplate] = None,
+) -> Pattern[str]:
+    """Build the single regex used to select pipeline issues by title.
+
+    Titles must start with the prefix and, when a template is given, also match
+    the template in full.
+    """
+    prefix_regex = re.escape(issue_prefix or "")
+    if title_template is None:
+        return re.compile(prefix_regex)
+    return re.compile(f"(?={prefix_regex}){title_template.pattern.pattern}", re.DOTALL)
+
+
+class IssueRecord(NamedTuple):
+    """The handful of issue fields the resource reads, decoded from raw page JSON.
+
+    Timestamps are stored already truncated to ``ISO_8601_FORMAT``.
+    """
+
+    number: int
+    title: str
+    state: str
+    created_at: str
+    closed_at: Optional[str]
+    url: str
+
+
+def decode_issue_page(
+    payload: str, title_pattern: Pattern[str] = compile_title_pattern()
+) -> list[IssueRecord]:
+    """Decode one page of the issues listing into records.
+
+    The title pattern is checked on the decoded dict, so no record is built for
+    issues that would be filtered out anyway.
+    """
+    return [
+        IssueRecord(
+            number=item["number"],
+            title=item["title"],
+            state=item["state"],
+            created_at=item["created_at"][:19],
+            closed_at=item["closed_at"][:19] if item.get("closed_at") else None,
+            url=item["url"],
+        )
+        for item in json_loads(payload)
+        if title_pattern.match(item["title"])
+    ]
+
+
+def profile_category(filename: str, function_name: str) -> str:
+    location = f"{filename}:{function_name}".replace("\\", "/")
+    for category, needles in PROFILE_CATEGORIES:
+        if any(needle in location for needle in needles):
+            return category
+    return "other"
+
+
+def profile_category_times(stats: pstats.Stats) -> dict[str, float]:
+    """Split the own time (tottime) of a profile into PROFILE_CATEGORIES.
+
+    Builtins that match no category, such as time.sleep or lock waits, are charged
+    to the categories of their callers in proportion to the time spent under each
+    caller, so PyGithub's request throttling counts as PyGithub rather than other.
+    """
+    category_times: dict[str, float] = {}
+    for (filename, _, function_name), stat in stats.stats.items():  # type: ignore[attr-defined]
+        category = profile_category(filename, function_name)
+        # Builtins are recorded with "~" as their filename
+        callers = stat[4] if category == "other" and filename == "~" else {}
+        for (caller_filename, _, caller_name), caller_stat in callers.items():
+            caller_category = profile_category(caller_filename, caller_name)
+            category_times[caller_category] = (
+                category_times.get(caller_category, 0.0) + caller_stat[2]
+            )
+        if not callers:
+            category_times[category] = category_times.get(category, 0.0) + stat[2]
+    return category_times
+
+
+def summarize_profile(
+    step_name: str,
+    profiler: cProfile.Profile,
+    snapshot: tracemalloc.Snapshot,
+    peak_memory: int,
+    top_n: int,
+) -> str:
+    """Render a plain-text summary of a profiled resource step.
+
+    Own time (tottime) is split into network wait, JSON decoding, PyGithub and
+    resource code so the categories add up to the total without double counting.
+    """
+    stats = pstats.Stats(profiler)
+    category_times = profile_category_times(stats)
+
+    summary = io.StringIO()
+    summary.write(f"=== profile: {step_name} ===\n")
+    summary.write(f"total time: {stats.total_tt:.3f}s\n")  # type: ignore[attr-defined]
+    for category, seconds in sorted(
+        category_times.items(), key=lambda item: item[1], reverse=True
+    ):
+        summary.write(f"  {category:<12} {seconds:.3f}s\n")
+    summary.write(f"peak traced memory: {peak_memory / 1024:.1f} KiB\n")
+    summary.write(f"top {top_n} allocation sites:\n")
+    for stat in snapshot.statistics("lineno")[:top_n]:
+        summary.write(f"  {stat}\n")
+    stats.stream = summary  # type: ignore[attr-defined]
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top_n)
+    return summary.getvalue()
+
+
+def profile_step(
+    output_dir_param: Optional[str] = None,
+) -> Callable[
+    [Callable[Concatenate[ResourceT, P], R]], Callable[Concatenate[ResourceT, P], R]
+]:
+    """Run a resource step under cProfile and tracemalloc when profiling is enabled.
+
+    :param output_dir_param: name of the step argument holding the build's output
+        directory. The pstats dump is written there unless a profile_dir is set.
+    """
+
+    def decorator(
+        func: Callable[Concatenate[ResourceT, P], R],
+    ) -> Callable[Concatenate[ResourceT, P], R]:
+        @functools.wraps(func)
+        def wrapper(self: ResourceT, *args: P.args, **kwargs: P.kwargs) -> R:
+            if not self.profile:
+                return func(self, *args, **kwargs)
+            output_dir = self.profile_dir
+            if output_dir is None and output_dir_param is not None:
+                bound = inspect.signature(func).bind(self, *args, **kwargs)
+                output_dir = bound.arguments.get(output_dir_param)
+
+            profiler = cProfile.Profile()
+            tracemalloc.start()
+            profiler.enable()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                profiler.disable()
+                snapshot = tracemalloc.take_snapshot()
+                _, peak_memory = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                summary = summarize_profile(
+                    func.__name__, profiler, snapshot, peak_memory, self.profile_top_n
+                )
+                print(summary, file=sys.stderr)
+                if output_dir is not None:
+                    profile_path = Path(output_dir)
+                    profile_path.mkdir(parents=True, exist_ok=True)
+                    profiler.dump_stats(profile_path / f"{func.__name__}.pstats")
+                    profile_path.joinpath(f"{func.__name__}.profile.txt").write_text(
+                        summary
+                    )
+
+        return wrapper
+
+    return decorator
+
+
 class ConcourseGithubIssuesVersion(Version, SortableVersionMixin):
     def __init__(
         self,
@@ -67,6 +415,10 @@ class ConcourseGithubIssuesVersion(Version, SortableVersionMixin):
 
 
 class ConcourseGithubIssuesResource(ConcourseResource):
+    # Set by the daemon while it runs a step, so resources built from the same
+    # source config are reused along with their Github session and caches.
+    resource_cache: Optional[dict[str, "ConcourseGithubIssuesResource"]] = None
+
     def __init__(
         self,
         /,
@@ -90,6 +442,19 @@ class ConcourseGithubIssuesResource(ConcourseResource):
         Closing this issue will trigger the next job in the pipeline {BUILD_PIPELINE_NAME}.
         """
         ),
+        comment_mode: Literal["append", "rolling"] = "append",
+        comment_history_size: int = 10,
+        comment_append_every: Optional[int] = None,
+        profile: bool = False,
+        profile_dir: Optional[str] = None,
+        profile_top_n: int = 20,
+        raw_issue_listing: bool = False,
+        backfill: bool = False,
+        backfill_start: Optional[str] = None,
+        backfill_window_days: int = 30,
+        backfill_concurrency: int = 4,
+        backfill_checkpoint_path: Optional[str] = None,
+        match_title_template: bool = False,
     ):
         super().__init__(ConcourseGithubIssuesVersion)
         if auth_method == "token":
@@ -99,7 +464,7 @@ class ConcourseGithubIssuesResource(ConcourseResource):
         self.gh = Github(base_url=gh_host, auth=auth, per_page=100)
         try:
             curr_limit = self.gh.get_rate_limit()
-            if curr_limit.core.remaining == 0:
+            if curr_limit.resources.core.remaining == 0:
                 sys.exit(1)
         except GithubException:
             # Rate limiting is not enabled
@@ -113,7 +478,113 @@ class ConcourseGithubIssuesResource(ConcourseResource):
         self.assignees = assignees
         self.issue_title_template = issue_title_template
         self.issue_body_template = issue_body_template
+        self.title_template = CompiledTemplate(issue_title_template)
+        self.body_template = CompiledTemplate(issue_body_template)
+        self.title_pattern = compile_title_pattern(
+            issue_prefix, self.title_template if match_title_template else None
+        )
+        # The build metadata of the current step and its template values
+        self.build_metadata_cache: Optional[Tuple[BuildMetadata, dict[str, str]]] = None
         self.limit_old_versions = limit_old_versions
+        self.comment_mode = comment_mode
+        self.comment_history_size = comment_history_size
+        self.comment_append_every = comment_append_every
+        # Maps issue number -> status comment id for the "rolling" comment mode
+        self.status_comment_ids: dict[int, int] = {}
+        self.profile = profile or os.environ.get(PROFILE_ENV_VAR, "").lower() in (
+            "1",
+            "true",
+            "yes",
+        )
+        self.profile_dir = profile_dir or os.environ.get(PROFILE_DIR_ENV_VAR)
+        self.profile_top_n = profile_top_n
+        self.raw_issue_listing = raw_issue_listing
+        self.backfill = backfill
+        self.backfill_start = backfill_start
+        self.backfill_window_days = backfill_window_days
+        self.backfill_concurrency = backfill_concurrency
+        self.backfill_checkpoint_path = backfill_checkpoint_path
+        # Start times of recent backfill searches, shared by the window workers
+        self.search_request_times: collections.deque[float] = collections.deque(
+            maxlen=SEARCH_REQUESTS_PER_MINUTE
+        )
+        self.search_pacing_lock = threading.Lock()
+
+    @classmethod
+    def _from_resource_config(cls, resource_config):
+        if cls.resource_cache is None:
+            return cls(**resource_config)
+        cache_key = json.dumps(resource_config, sort_keys=True)
+        if cache_key not in cls.resource_cache:
+            cls.resource_cache[cache_key] = cls(**resource_config)
+        return cls.resource_cache[cache_key]
+
+    @classmethod
+    def check_main(cls):
+        if not cls.forward_to_daemon("check"):
+            super().check_main()
+
+    @classmethod
+    def in_main(cls):
+        if not cls.forward_to_daemon("in"):
+            super().in_main()
+
+    @classmethod
+    def out_main(cls):
+        if not cls.forward_to_daemon("out"):
+            super().out_main()
+
+    @classmethod
+    def forward_to_daemon(cls, step: str) -> bool:
+        """Run a step in the daemon, returning False if it should run in-process.
+
+        Only a failure to reach the daemon falls back to in-process execution; once
+        the payload has been handed over, a failure is reported rather than retried
+        so a put cannot create its issue twice.
+        """
+        socket_path = os.environ.get(DAEMON_SOCKET_ENV_VAR)
+        if cls.resource_cache is not None or not socket_path:
+            return False
+        payload = sys.stdin.read()
+        timeout = float(os.environ.get(DAEMON_TIMEOUT_ENV_VAR, DAEMON_DEFAULT_TIMEOUT))
+        try:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(timeout)
+            connection.connect(socket_path)
+        except OSError as exc:
+            print(
+                f"Warning: daemon unavailable at {socket_path} ({exc}), running in-process",
+                file=sys.stderr,
+            )
+            sys.stdin = io.StringIO(payload)
+            return False
+
+        request = {
+            "step": step,
+            "payload": payload,
+            "args": sys.argv[1:],
+            "env": {
+                name: os.environ[name]
+                for name in DAEMON_FORWARDED_ENV_VARS
+                if name in os.environ
+            },
+        }
+        with connection, connection.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode() + b"\n")
+            stream.flush()
+            try:
+                response = json.loads(stream.readline() or b"{}")
+            except TimeoutError:
+                sys.exit(
+                    f"daemon at {socket_path} did not finish the {step} step "
+                    f"within {timeout:g}s"
+                )
+        sys.stderr.write(response.get("stderr", ""))
+        sys.stdout.write(response.get("stdout", ""))
+        exit_code = response.get("exit_code", 1)
+        if exit_code:
+            sys.exit(exit_code)
+        return True
 
     def auth_token(self, access_token):
         return Auth.Token(access_token)
@@ -137,6 +608,16 @@ class ConcourseGithubIssuesResource(ConcourseResource):
             issue_closed_at=issue_closed_time,
         )
 
+    def _record_to_version(self, record: IssueRecord) -> ConcourseGithubIssuesVersion:
+        return ConcourseGithubIssuesVersion(
+            issue_number=record.number,
+            issue_title=record.title,
+            issue_state=record.state,  # type: ignore[arg-type]
+            issue_created_at=record.created_at,
+            issue_url=record.url,
+            issue_closed_at=record.closed_at if record.state == "closed" else None,
+        )
+
     def _from_version(self, version: ConcourseGithubIssuesVersion) -> Issue:
         return self.repo.get_issue(int(version.issue_number))
 
@@ -153,6 +634,55 @@ class ConcourseGithubIssuesResource(ConcourseResource):
             state=issue_state, labels=self.issue_labels or [], since=since_param
         )
 
+    def get_all_issue_records(
+        self,
+        issue_state: Optional[Literal["open", "closed"]] = None,
+        since: Optional[datetime] = None,
+    ) -> Iterator[IssueRecord]:
+        """List issues as lightweight records, bypassing PyGithub Issue objects.
+
+        Pages are requested directly and only issues whose title starts with the
+        configured prefix are decoded into records.
+        """
+        query: dict[str, Any] = {
+            "state": issue_state or self.issue_state,
+            "per_page": 100,
+        }
+        if self.issue_labels:
+            query["labels"] = ",".join(self.issue_labels)
+        if since is not None:
+            query["since"] = since.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        parameters: Optional[dict[str, Any]] = query
+        url: Optional[str] = f"{self.repo.url}/issues"
+        while url:
+            status, headers, output = self.gh.requester.requestJson(
+                "GET", url, parameters=parameters
+            )
+            if status >= 400:
+                raise GithubException(
+                    status, json.loads(output) if output else None, headers
+                )
+            yield from decode_issue_page(output, self.title_pattern)
+            next_page = NEXT_PAGE_PATTERN.search(headers.get("link", ""))
+            # The next page URL already carries the query parameters
+            url = next_page.group(1) if next_page else None
+            parameters = None
+
+    def get_matching_issue_records(
+        self, since: Optional[datetime] = None
+    ) -> list[IssueRecord]:
+        matching_records = []
+        for record in self.get_all_issue_records(since=since):
+            matching_records.append(record)
+            if (
+                self.limit_old_versions
+                and len(matching_records) == self.limit_old_versions
+            ):
+                break
+        matching_records.sort(key=lambda record: record.number)
+        return matching_records
+
     def get_exact_title_match(
         self, title: str, state: Literal["open", "closed"]
     ) -> list[Issue]:
@@ -172,7 +702,7 @@ class ConcourseGithubIssuesResource(ConcourseResource):
 
         matching_issues = []
         for issue in all_pipeline_issues:
-            if issue.title.startswith(self.issue_prefix or ""):
+            if self.title_pattern.match(issue.title):
                 matching_issues.append(issue)
                 if (
                     self.limit_old_versions
@@ -183,9 +713,172 @@ class ConcourseGithubIssuesResource(ConcourseResource):
         matching_issues.sort(key=lambda issue: issue.number)
         return matching_issues
 
+    def get_backfill_windows(
+        self, start: datetime, end: datetime
+    ) -> list[Tuple[datetime, datetime]]:
+        """Split [start, end] into consecutive, non-overlapping closed_at windows."""
+        window = timedelta(days=self.backfill_window_days)
+        windows = []
+        while start <= end:
+            window_end = min(start + window - timedelta(seconds=1), end)
+            windows.append((start, window_end))
+            start = window_end + timedelta(seconds=1)
+        return windows
+
+    def wait_for_search_slot(self):
+        """Block until another search request fits in the per-minute search limit."""
+        with self.search_pacing_lock:
+            if len(self.search_request_times) == SEARCH_REQUESTS_PER_MINUTE:
+                time.sleep(
+                    max(0.0, self.search_request_times[0] + 60 - time.monotonic())
+                )
+            self.search_request_times.append(time.monotonic())
+
+    def search_closed_window(
+        self, start: datetime, end: datetime
+    ) -> list[ConcourseGithubIssuesVersion]:
+        """Search one closed_at window, ordered by closed_at.
+
+        Windows holding more results than the search API will return are split
+        in half until they fit. Pages are requested one at a time so that every
+        request is paced, and the total count comes with the first page.
+        """
+        qualifiers = [
+            f"repo:{self.repo.full_name}",
+            "is:issue",
+            "state:closed",
+            f"closed:{start.strftime(SEARCH_TIMESTAMP_FORMAT)}"
+            f"..{end.strftime(SEARCH_TIMESTAMP_FORMAT)}",
+        ]
+        qualifiers.extend(f'label:"{label}"' for label in self.issue_labels or [])
+        if self.issue_prefix:
+            safe_prefix = self.issue_prefix.replace('"', '\\"')
+            qualifiers.append(f'"{safe_prefix}" in:title')
+        search_results = self.gh.search_issues(" ".join(qualifiers))
+        self.wait_for_search_slot()
+        issues = search_results.get_page(0)
+        # get_page records total_count, so totalCount makes no further request
+        if search_results.totalCount > SEARCH_RESULT_LIMIT and end > start:
+            middle = (start + (end - start) / 2).replace(microsecond=0)
+            return self.search_closed_window(start, middle) + self.search_closed_window(
+                middle + timedelta(seconds=1), end
+            )
+
+        page, page_issues = 0, issues
+        while page_issues and len(issues) < search_results.totalCount:
+            page += 1
+            self.wait_for_search_slot()
+            page_issues = search_results.get_page(page)
+            issues.extend(page_issues)
+
+        versions = [
+            self._to_version(issue)
+            for issue in issues
+            # in:title matches words anywhere in the title, not just the prefix
+            if self.title_pattern.match(issue.title)
+        ]
+        return sorted(
+            versions,
+            key=lambda version: (version.issue_closed_at, version.issue_number),
+        )
+
+    def get_backfill_checkpoint_path(self, start: datetime) -> Path:
+        if self.backfill_checkpoint_path:
+            return Path(self.backfill_checkpoint_path)
+        checkpoint_key = json.dumps(
+            [
+                self.repo.full_name,
+                self.issue_prefix,
+                self.issue_labels,
+                start.strftime(SEARCH_TIMESTAMP_FORMAT),
+            ]
+        )
+        digest = hashlib.sha1(checkpoint_key.encode()).hexdigest()[:12]
+        return Path(tempfile.gettempdir()) / f"concourse-github-issues-{digest}.json"
+
+    def iter_backfill_versions(
+        self, start: datetime, end: datetime
+    ) -> Iterator[ConcourseGithubIssuesVersion]:
+        """Stream closed issues in closed_at order, fetching windows concurrently.
+
+        Progress is checkpointed after every window, so an interrupted backfill
+        resumes from the last completed window instead of starting over.
+        """
+        checkpoint_path = self.get_backfill_checkpoint_path(start)
+        completed_until = start - timedelta(seconds=1)
+        completed_versions: list[dict[str, str]] = []
+        if checkpoint_path.exists():
+            checkpoint = json.loads(checkpoint_path.read_text())
+            completed_until = datetime.strptime(
+                checkpoint["completed_until"], SEARCH_TIMESTAMP_FORMAT
+            ).replace(tzinfo=timezone.utc)
+            completed_versions = checkpoint["versions"]
+            print(f"Resuming backfill from {checkpoint['completed_until']}")
+            for flat_version in completed_versions:
+                yield ConcourseGithubIssuesVersion.from_flat_dict(flat_version)
+
+        windows = iter(
+            self.get_backfill_windows(completed_until + timedelta(seconds=1), end)
+        )
+        with ThreadPoolExecutor(max_workers=self.backfill_concurrency) as executor:
+            # Only backfill_concurrency windows are in flight; the next one is
+            # submitted as the oldest completes rather than queueing them all
+            pending = collections.deque(
+                (window, executor.submit(self.search_closed_window, *window))
+                for window in itertools.islice(windows, self.backfill_concurrency)
+            )
+            try:
+                while pending:
+                    (_, window_end), future = pending.popleft()
+                    window_versions = future.result()
+                    next_window = next(windows, None)
+                    if next_window is not None:
+                        next_future = executor.submit(
+                            self.search_closed_window, *next_window
+                        )
+                        pending.append((next_window, next_future))
+                    completed_versions.extend(
+                        version.to_flat_dict() for version in window_versions
+                    )
+                    checkpoint_path.write_text(
+                        json.dumps(
+                            {
+                                "completed_until": window_end.strftime(
+                                    SEARCH_TIMESTAMP_FORMAT
+                                ),
+                                "versions": completed_versions,
+                            }
+                        )
+                    )
+                    yield from window_versions
+            except BaseException:
+                for _, future in pending:
+                    future.cancel()
+                raise
+        checkpoint_path.unlink(missing_ok=True)
+
+    def fetch_backfill_versions(
+        self, since: Optional[datetime] = None
+    ) -> list[ConcourseGithubIssuesVersion]:
+        """Walk closed issues by closed_at rather than by creation/update order."""
+        if since is not None:
+            start = since.replace(tzinfo=timezone.utc)
+        elif self.backfill_start:
+            start = datetime.strptime(self.backfill_start, ISO_8601_FORMAT).replace(
+                tzinfo=timezone.utc
+            )
+        else:
+            start = self.repo.created_at.astimezone(timezone.utc)
+        end = datetime.now(timezone.utc).replace(microsecond=0)
+        versions = list(self.iter_backfill_versions(start, end))
+        if self.limit_old_versions:
+            versions = versions[-self.limit_old_versions :]
+        return versions
+
+    @profile_step()
     def fetch_new_versions(
         self, previous_version: Optional[ConcourseGithubIssuesVersion] = None
-    ) -> set[ConcourseGithubIssuesVersion]:
+    ) -> set[ConcourseGithubIssuesVersion] | list[ConcourseGithubIssuesVersion]:
         """Fetch new versions since the previous one."""
         since_datetime: Optional[datetime] = None
         if previous_version:
@@ -207,8 +900,19 @@ class ConcourseGithubIssuesResource(ConcourseResource):
                     print(f"Warning: Could not parse timestamp {timestamp_str}")
                     pass  # Proceed without 'since' if parsing fails
 
-        matching_issues = self.get_matching_issues(since=since_datetime)
-        versions = {self._to_version(issue) for issue in matching_issues}
+        if self.backfill and self.issue_state == "closed":
+            # Already in closed_at order, as Concourse expects oldest first
+            backfill_versions = self.fetch_backfill_versions(since=since_datetime)
+            if previous_version in backfill_versions:
+                backfill_versions.remove(previous_version)
+            return backfill_versions
+
+        if self.raw_issue_listing:
+            matching_records = self.get_matching_issue_records(since=since_datetime)
+            versions = {self._record_to_version(record) for record in matching_records}
+        else:
+            matching_issues = self.get_matching_issues(since=since_datetime)
+            versions = {self._to_version(issue) for issue in matching_issues}
         # Filter out the previous_version itself if it happens to be included
         if previous_version and previous_version in versions:
             versions.remove(previous_version)
@@ -227,6 +931,7 @@ class ConcourseGithubIssuesResource(ConcourseResource):
             issue = self.repo.get_issue(int(version.issue_number))  # API Call 1
             issue.edit(title=new_title)
 
+    @profile_step(output_dir_param="destination_dir")
     def download_version(
         self,
         version: ConcourseGithubIssuesVersion,
@@ -240,12 +945,24 @@ class ConcourseGithubIssuesResource(ConcourseResource):
         self.tombstone_version(version, build_metadata)
         return version, {}
 
+    def get_build_metadata_values(
+        self, build_metadata: BuildMetadata
+    ) -> dict[str, str]:
+        if self.build_metadata_cache and self.build_metadata_cache[0] is build_metadata:
+            return self.build_metadata_cache[1]
+        values = build_metadata_dict(build_metadata)
+        self.build_metadata_cache = (build_metadata, values)
+        return values
+
     def get_issue_body_from_build(self, build_metadata: BuildMetadata) -> str:
-        return self.issue_body_template.format(**build_metadata_dict(build_metadata))
+        return self.body_template.render(self.get_build_metadata_values(build_metadata))
 
     def get_title_from_build(self, build_metadata: BuildMetadata) -> str:
-        return self.issue_title_template.format(**build_metadata_dict(build_metadata))
+        return self.title_template.render(
+            self.get_build_metadata_values(build_metadata)
+        )
 
+    @profile_step()
     def publish_new_version(
         self,
         sources_dir,
@@ -281,7 +998,214 @@ class ConcourseGithubIssuesResource(ConcourseResource):
         else:
             working_issue = already_exists[0]
             comment_body = self.get_issue_body_from_build(build_metadata)
-            print(f"about to comment on {working_issue=} with {comment_body=}")
-            working_issue.create_comment(comment_body)
+            if self.comment_mode == "rolling":
+                self.update_status_comment(working_issue, build_metadata, comment_body)
+            else:
+                print(f"about to comment on {working_issue=} with {comment_body=}")
+                working_issue.create_comment(comment_body)
 
         return self._to_version(working_issue), {}
+
+    def get_status_comment_id(self, issue: Issue) -> Optional[int]:
+        """Look up the status comment id from the cache or the issue body marker."""
+        if issue.number in self.status_comment_ids:
+            return self.status_comment_ids[issue.number]
+        match = STATUS_COMMENT_ID_PATTERN.search(issue.body or "")
+        if not match:
+            return None
+        comment_id = int(match.group(1))
+        self.status_comment_ids[issue.number] = comment_id
+        return comment_id
+
+    def set_status_comment_id(self, issue: Issue, comment_id: int):
+        """Record the status comment id in the issue body and the local cache."""
+        marker = STATUS_COMMENT_ID_MARKER.format(comment_id)
+        body = issue.body or ""
+        if STATUS_COMMENT_ID_PATTERN.search(body):
+            new_body = STATUS_COMMENT_ID_PATTERN.sub(marker, body)
+        else:
+            new_body = f"{body}\n\n{marker}" if body else marker
+        issue.edit(body=new_body)
+        self.status_comment_ids[issue.number] = comment_id
+
+    def get_status_history_row(self, build_metadata: BuildMetadata) -> str:
+        metadata = self.get_build_metadata_values(build_metadata)
+        return "| {BUILD_NAME} | {BUILD_JOB_NAME} | [build log]({BUILD_URL}) |".format(
+            **metadata
+        )
+
+    def render_status_comment(
+        self, comment_body: str, history: list[str], builds_since_append: int
+    ) -> str:
+        return "\n".join(
+            [
+                STATUS_COMMENT_STATE_MARKER.format(builds_since_append),
+                "**Latest build**",
+                "",
+                comment_body.rstrip("\n"),
+                "",
+                "**Recent builds**",
+                "",
+                STATUS_HISTORY_HEADER,
+                *history,
+            ]
+        )
+
+    def parse_status_comment(self, status_body: str) -> Tuple[list[str], int]:
+        """Extract the history rows and append counter from a status comment."""
+        state_match = STATUS_COMMENT_STATE_PATTERN.search(status_body)
+        builds_since_append = int(state_match.group(1)) if state_match else 0
+        _, _, table = status_body.partition(STATUS_HISTORY_HEADER)
+        history = [line for line in table.splitlines() if line.startswith("| ")]
+        return history, builds_since_append
+
+    def update_status_comment(
+        self, issue: Issue, build_metadata: BuildMetadata, comment_body: str
+    ):
+        """Edit the bot-owned status comment in place with the latest build.
+
+        The comment is located through its cached id, never by listing comments.
+        If it is missing (first put, or deleted by a human) a new one is created.
+        When ``comment_append_every`` is set, the full build comment is also
+        appended to the issue once every N builds.
+        """
+        status_comment = None
+        history: list[str] = []
+        builds_since_append = 0
+        comment_id = self.get_status_comment_id(issue)
+        if comment_id is not None:
+            try:
+                status_comment = issue.get_comment(comment_id)
+            except GithubException as exc:
+                if exc.status != 404:
+                    raise
+                self.status_comment_ids.pop(issue.number, None)
+            else:
+                history, builds_since_append = self.parse_status_comment(
+                    status_comment.body or ""
+                )
+
+        builds_since_append += 1
+        if (
+            self.comment_append_every
+            and builds_since_append >= self.comment_append_every
+        ):
+            print(f"about to comment on {issue=} with {comment_body=}")
+            issue.create_comment(comment_body)
+            builds_since_append = 0
+
+        history.insert(0, self.get_status_history_row(build_metadata))
+        status_body = self.render_status_comment(
+            comment_body,
+            history[: self.comment_history_size],
+            builds_since_append,
+        )
+        if status_comment is not None:
+            print(f"about to update status comment {status_comment.id} on {issue=}")
+            status_comment.edit(status_body)
+        else:
+            status_comment = issue.create_comment(status_body)
+            print(f"created status comment {status_comment.id} on {issue=}")
+            self.set_status_comment_id(issue, status_comment.id)
+
+
+class ResourceDaemonHandler(socketserver.StreamRequestHandler):
+    """Run one forwarded check/in/out step against the daemon's warm resources."""
+
+    server: "ResourceDaemon"
+
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        response = self.server.run_step(
+            request["step"], request["payload"], request["args"], request["env"]
+        )
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class ResourceDaemon(socketserver.UnixStreamServer):
+    """Long-running local server that keeps authenticated resources warm.
+
+    Steps are handled one at a time, because each swaps in the forwarded stdin,
+    argv and build environment and captures stdout/stderr, which are all
+    process-wide. A slow step therefore delays every other step on the host; the
+    clients' DAEMON_TIMEOUT_ENV_VAR bounds how long they wait.
+
+    The socket is only accessible to the daemon's user, as forwarded environment
+    such as the profile directory decides where the daemon writes files.
+    """
+
+    def __init__(self, socket_path: str):
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(socket_path)
+        self.socket_path = socket_path
+        self.resource_cache: dict[str, ConcourseGithubIssuesResource] = {}
+        super().__init__(socket_path, ResourceDaemonHandler)
+
+    def server_bind(self):
+        # Create the socket without group/other access, then make sure of it
+        previous_umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(previous_umask)
+        os.chmod(self.socket_path, 0o600)
+
+    def run_step(
+        self, step: str, payload: str, args: list[str], env: dict[str, str]
+    ) -> dict[str, Any]:
+        stdout, stderr = io.StringIO(), io.StringIO()
+        saved_stdin, saved_argv = sys.stdin, sys.argv
+        saved_env = {name: os.environ.get(name) for name in DAEMON_FORWARDED_ENV_VARS}
+        sys.stdin = io.StringIO(payload)
+        sys.argv = [step, *args]
+        for name in DAEMON_FORWARDED_ENV_VARS:
+            os.environ.pop(name, None)
+        os.environ.update(env)
+        ConcourseGithubIssuesResource.resource_cache = self.resource_cache
+        exit_code = 0
+        try:
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    getattr(ConcourseGithubIssuesResource, DAEMON_STEP_METHODS[step])()
+                except SystemExit as exc:
+                    # Mirror the interpreter: None is success, a message fails
+                    if exc.code is None:
+                        exit_code = 0
+                    elif isinstance(exc.code, int):
+                        exit_code = exc.code
+                    else:
+                        print(exc.code, file=sys.stderr)
+                        exit_code = 1
+                except Exception:
+                    traceback.print_exc()
+                    exit_code = 1
+        finally:
+            ConcourseGithubIssuesResource.resource_cache = None
+            sys.stdin, sys.argv = saved_stdin, saved_argv
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+        return {
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+            "exit_code": exit_code,
+        }
+
+
+def serve_daemon(socket_path: str):
+    with ResourceDaemon(socket_path) as daemon:
+        print(f"serving concourse-github-issues daemon on {socket_path}")
+        daemon.serve_forever()
+
+
+if __name__ == "__main__":
+    # python3 concourse.py daemon [SOCKET_PATH]
+    if sys.argv[1:2] != ["daemon"]:
+        sys.exit("usage: concourse.py daemon [SOCKET_PATH]")
+    serve_daemon(
+        sys.argv[2]
+        if len(sys.argv) > 2
+        else os.environ.get(DAEMON_SOCKET_ENV_VAR, "/tmp/concourse-github-issues.sock")
+    )
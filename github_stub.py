@@ -0,0 +1,439 @@
+"""
+A small in-memory stand-in for the parts of the GitHub REST API this resource uses.
+
+    stub = GithubStub()
+    stub.start()
+    source = {"repository": "test/repo", "access_token": "x", "gh_host": stub.url}
+
+It serves issue listing, creation and editing, issue comments, the issue search
+endpoint and the rate limit endpoint for any ``owner/repo``. Optionally it models
+per-token primary rate limits (core and search), secondary rate limits on
+writes, log-normal response latency and search indexing lag. It is used by the
+benchmark and soak test scripts and is not shipped in the resource image.
+"""
+
+import collections
+import json
+import math
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+REPO_PATTERN = re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)(?P<rest>/.*)?$")
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).strftime(ISO_FORMAT)
+
+
+class GithubStub:
+    """Thread-safe issue store plus an HTTP server exposing it.
+
+    :param latency_median_ms: median of the log-normal delay added to every
+        response; 0 disables it.
+    :param latency_sigma: shape of the log-normal delay; larger means a longer tail.
+    :param core_limit: requests allowed per token per ``rate_window`` seconds.
+    :param search_limit: search requests allowed per token per minute.
+    :param secondary_write_limit: writes allowed per token per
+        ``secondary_window`` seconds before a secondary rate limit is returned;
+        None disables it.
+    :param search_lag: seconds before a new issue shows up in search results.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_median_ms: float = 0.0,
+        latency_sigma: float = 0.5,
+        core_limit: int = 5000,
+        rate_window: float = 3600.0,
+        search_limit: int = 30,
+        secondary_write_limit: Optional[int] = None,
+        secondary_window: float = 1.0,
+        search_lag: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.lock = threading.Lock()
+        self.issues: dict[str, dict[int, dict[str, Any]]] = {}
+        self.comments: dict[int, dict[str, Any]] = {}
+        self.next_comment_id = 1
+        self.request_count = 0
+        self.latency_median_ms = latency_median_ms
+        self.latency_sigma = latency_sigma
+        self.limits = {
+            "core": (core_limit, rate_window),
+            "search": (search_limit, 60.0),
+        }
+        self.secondary_write_limit = secondary_write_limit
+        self.secondary_window = secondary_window
+        self.search_lag = search_lag
+        self.random = random.Random(seed)
+        # (token, resource) -> [window start, requests used]
+        self.rate_buckets: dict[tuple[str, str], list[float]] = {}
+        self.recent_writes: dict[str, collections.deque[float]] = {}
+        self.stats = {
+            "requests": 0,
+            "rate_limited": 0,
+            "secondary_rate_limited": 0,
+            "issues_created": 0,
+            "duplicate_issues": 0,
+        }
+        self.server = ThreadingHTTPServer((host, port), GithubStubHandler)
+        self.server.stub = self  # type: ignore[attr-defined]
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def response_delay(self) -> float:
+        if not self.latency_median_ms:
+            return 0.0
+        return (
+            self.random.lognormvariate(
+                math.log(self.latency_median_ms), self.latency_sigma
+            )
+            / 1000
+        )
+
+    def rate_limit_status(self, token: str, resource: str) -> dict[str, int]:
+        limit, window = self.limits[resource]
+        now = time.time()
+        with self.lock:
+            bucket = self.rate_buckets.setdefault((token, resource), [now, 0])
+            if now - bucket[0] >= window:
+                bucket[:] = [now, 0]
+            return {
+                "limit": limit,
+                "remaining": max(limit - int(bucket[1]), 0),
+                "reset": math.ceil(bucket[0] + window),
+                "used": int(bucket[1]),
+            }
+
+    def consume_rate_limit(
+        self, token: str, resource: str, write: bool
+    ) -> tuple[Optional[str], dict[str, str]]:
+        """Count one request, returning (error message, headers) for the response."""
+        status = self.rate_limit_status(token, resource)
+        headers = {
+            "X-RateLimit-Limit": str(status["limit"]),
+            "X-RateLimit-Remaining": str(max(status["remaining"] - 1, 0)),
+            "X-RateLimit-Reset": str(status["reset"]),
+            "X-RateLimit-Resource": resource,
+        }
+        with self.lock:
+            if status["remaining"] <= 0:
+                self.stats["rate_limited"] += 1
+                return "API rate limit exceeded", headers
+            if write and self.secondary_write_limit is not None:
+                now = time.monotonic()
+                writes = self.recent_writes.setdefault(token, collections.deque())
+                while writes and now - writes[0] >= self.secondary_window:
+                    writes.popleft()
+                if len(writes) >= self.secondary_write_limit:
+                    self.stats["secondary_rate_limited"] += 1
+                    retry_after = str(math.ceil(self.secondary_window))
+                    return "You have exceeded a secondary rate limit", {
+                        **headers,
+                        "Retry-After": retry_after,
+                    }
+                writes.append(now)
+            self.rate_buckets[(token, resource)][1] += 1
+        return None, headers
+
+    def repo_json(self, repo: str) -> dict[str, Any]:
+        owner, name = repo.split("/")
+        return {
+            "id": abs(hash(repo)) % 10**8,
+            "name": name,
+            "full_name": repo,
+            "owner": {"login": owner},
+            "url": f"{self.url}/repos/{repo}",
+            "html_url": f"https://github.com/{repo}",
+        }
+
+    def issue_json(self, repo: str, issue: dict[str, Any]) -> dict[str, Any]:
+        number = issue["number"]
+        return {
+            **{key: value for key, value in issue.items() if not key.startswith("_")},
+            "url": f"{self.url}/repos/{repo}/issues/{number}",
+            "html_url": f"https://github.com/{repo}/issues/{number}",
+            "repository_url": f"{self.url}/repos/{repo}",
+            "comments_url": f"{self.url}/repos/{repo}/issues/{number}/comments",
+            "labels": [{"name": label} for label in issue["labels"]],
+            "assignees": [{"login": login} for login in issue["assignees"]],
+            "user": {"login": "stub-bot"},
+        }
+
+    def add_issue(
+        self,
+        repo: str,
+        title: str,
+        body: str = "",
+        labels: Optional[list[str]] = None,
+        assignees: Optional[list[str]] = None,
+        state: str = "open",
+    ) -> dict[str, Any]:
+        with self.lock:
+            repo_issues = self.issues.setdefault(repo, {})
+            number = len(repo_issues) + 1
+            now = utc_now()
+            self.stats["issues_created"] += 1
+            if any(
+                other["title"] == title and other["state"] == "open"
+                for other in repo_issues.values()
+            ):
+                self.stats["duplicate_issues"] += 1
+            issue = {
+                "id": number,
+                "number": number,
+                "title": title,
+                "body": body,
+                "state": state,
+                "labels": list(labels or []),
+                "assignees": list(assignees or []),
+                "comments": 0,
+                "created_at": now,
+                "updated_at": now,
+                "closed_at": now if state == "closed" else None,
+                "_indexed_at": time.monotonic() + self.search_lag,
+            }
+            repo_issues[number] = issue
+            return issue
+
+    def edit_issue(self, repo: str, number: int, changes: dict[str, Any]):
+        with self.lock:
+            issue = self.issues[repo][number]
+            now = utc_now()
+            if changes.get("state") == "closed" and issue["state"] != "closed":
+                issue["closed_at"] = now
+            elif changes.get("state") == "open":
+                issue["closed_at"] = None
+            for field in ("title", "body", "state", "labels", "assignees"):
+                if field in changes:
+                    issue[field] = changes[field]
+            issue["updated_at"] = now
+            return issue
+
+    def list_issues(
+        self, repo: str, state: str, labels: list[str], since: Optional[str]
+    ) -> list[dict[str, Any]]:
+        with self.lock:
+            issues = list(self.issues.get(repo, {}).values())
+        return sorted(
+            (
+                issue
+                for issue in issues
+                if state in ("all", issue["state"])
+                and set(labels) <= set(issue["labels"])
+                and (since is None or issue["updated_at"] >= since)
+            ),
+            key=lambda issue: issue["number"],
+            reverse=True,
+        )
+
+    def search_issues(self, query: str) -> list[tuple[str, dict[str, Any]]]:
+        repo_match = re.search(r"repo:(\S+)", query)
+        state_match = re.search(r"state:(open|closed)", query)
+        phrase_match = re.search(r'"((?:[^"\\]|\\.)*)"', query)
+        phrase = phrase_match.group(1).replace('\\"', '"') if phrase_match else ""
+        now = time.monotonic()
+        with self.lock:
+            repos = [repo_match.group(1)] if repo_match else list(self.issues)
+            return [
+                (repo, issue)
+                for repo in repos
+                for issue in self.issues.get(repo, {}).values()
+                if issue["_indexed_at"] <= now
+                and phrase in issue["title"]
+                and (not state_match or issue["state"] == state_match.group(1))
+            ]
+
+    def add_comment(self, repo: str, number: int, body: str) -> dict[str, Any]:
+        with self.lock:
+            comment_id = self.next_comment_id
+            self.next_comment_id += 1
+            comment = {
+                "id": comment_id,
+                "body": body,
+                "repo": repo,
+                "issue_number": number,
+                "created_at": utc_now(),
+                "updated_at": utc_now(),
+            }
+            self.comments[comment_id] = comment
+            self.issues[repo][number]["comments"] += 1
+            return comment
+
+    def comment_json(self, comment: dict[str, Any]) -> dict[str, Any]:
+        repo = comment["repo"]
+        return {
+            "id": comment["id"],
+            "body": comment["body"],
+            "url": f"{self.url}/repos/{repo}/issues/comments/{comment['id']}",
+            "html_url": f"https://github.com/{repo}/issues/{comment['issue_number']}",
+            "created_at": comment["created_at"],
+            "updated_at": comment["updated_at"],
+            "user": {"login": "stub-bot"},
+        }
+
+
+class GithubStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def stub(self) -> GithubStub:
+        return self.server.stub  # type: ignore[attr-defined]
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(
+        self, status: int, data: Any, headers: Optional[dict[str, str]] = None
+    ):
+        headers = {**getattr(self, "rate_limit_headers", {}), **(headers or {})}
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PATCH(self):
+        self.dispatch("PATCH")
+
+    def dispatch(self, verb: str):
+        with self.stub.lock:
+            self.stub.request_count += 1
+            self.stub.stats["requests"] += 1
+        parsed = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        time.sleep(self.stub.response_delay())
+        token = self.headers.get("Authorization", "anonymous")
+        self.rate_limit_headers: dict[str, str] = {}
+        if parsed.path != "/rate_limit":
+            resource = "search" if parsed.path.startswith("/search/") else "core"
+            error, self.rate_limit_headers = self.stub.consume_rate_limit(
+                token, resource, write=verb != "GET"
+            )
+            if error:
+                # Drain the request body so the keep-alive connection stays usable
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self.send_json(403, {"message": error})
+                return
+        try:
+            self.route(verb, parsed.path, query)
+        except KeyError:
+            self.send_json(404, {"message": "Not Found"})
+
+    def route(self, verb: str, path: str, query: dict[str, str]):
+        if path == "/rate_limit":
+            token = self.headers.get("Authorization", "anonymous")
+            core = self.stub.rate_limit_status(token, "core")
+            search = self.stub.rate_limit_status(token, "search")
+            self.send_json(
+                200, {"resources": {"core": core, "search": search}, "rate": core}
+            )
+            return
+        if path == "/search/issues":
+            results = self.stub.search_issues(query.get("q", ""))
+            items = [self.stub.issue_json(repo, issue) for repo, issue in results]
+            self.send_json(
+                200,
+                {
+                    "total_count": len(items),
+                    "incomplete_results": False,
+                    "items": items,
+                },
+            )
+            return
+        match = REPO_PATTERN.match(path)
+        if not match:
+            raise KeyError(path)
+        repo, rest = match.group("repo"), match.group("rest") or ""
+        parts = rest.strip("/").split("/") if rest else []
+        if not parts:
+            self.send_json(200, self.stub.repo_json(repo))
+        elif parts == ["issues"] and verb == "GET":
+            self.list_issues(repo, path, query)
+        elif parts == ["issues"] and verb == "POST":
+            data = self.read_json()
+            issue = self.stub.add_issue(
+                repo,
+                data["title"],
+                data.get("body", ""),
+                data.get("labels"),
+                data.get("assignees"),
+            )
+            self.send_json(201, self.stub.issue_json(repo, issue))
+        elif parts[:2] == ["issues", "comments"]:
+            comment = self.stub.comments[int(parts[2])]
+            if verb == "PATCH":
+                body = self.read_json()["body"]
+                with self.stub.lock:
+                    comment["body"] = body
+                    comment["updated_at"] = utc_now()
+            self.send_json(200, self.stub.comment_json(comment))
+        elif len(parts) == 2 and parts[0] == "issues":
+            number = int(parts[1])
+            if verb == "PATCH":
+                issue = self.stub.edit_issue(repo, number, self.read_json())
+            else:
+                issue = self.stub.issues[repo][number]
+            self.send_json(200, self.stub.issue_json(repo, issue))
+        elif len(parts) == 3 and parts[2] == "comments" and verb == "POST":
+            comment = self.stub.add_comment(
+                repo, int(parts[1]), self.read_json()["body"]
+            )
+            self.send_json(201, self.stub.comment_json(comment))
+        else:
+            raise KeyError(path)
+
+    def list_issues(self, repo: str, path: str, query: dict[str, str]):
+        labels = [label for label in query.get("labels", "").split(",") if label]
+        issues = self.stub.list_issues(
+            repo, query.get("state", "open"), labels, query.get("since")
+        )
+        per_page = int(query.get("per_page", 30))
+        page = int(query.get("page", 1))
+        start = (page - 1) * per_page
+        headers = {}
+        if start + per_page < len(issues):
+            next_query = urlencode({**query, "page": page + 1})
+            headers["Link"] = f'<{self.stub.url}{path}?{next_query}>; rel="next"'
+        self.send_json(
+            200,
+            [
+                self.stub.issue_json(repo, issue)
+                for issue in issues[start : start + per_page]
+            ],
+            headers,
+        )
@@ -0,0 +1,303 @@
+"""
+Load and soak test a fleet of simulated pipelines against a local GitHub stub.
+
+    python soak_harness.py --workers 20 --cycles 10 --interval 2 \\
+        --latency-median-ms 80 --search-lag 3 --output report.json
+
+Each worker process simulates one pipeline sharing a single repository, as the
+pipelines in a Concourse fleet do. Every cycle it runs the resource's `out` step
+(publish_new_version), has a "human" close the issue with some probability, runs
+`check` (fetch_new_versions) for closed issues and then `in` (download_version)
+for every new version. Each step builds a fresh resource, as Concourse runs each
+step in a new process.
+
+The stub (see github_stub.py) models per-token primary and search rate limits,
+secondary rate limits on writes, log-normal latency and search indexing lag.
+The machine-readable report contains throughput, p50/p99 latency per step,
+duplicate issues created by `out`, and versions that `check` missed or emitted
+more than once compared to the issues that were actually closed.
+"""
+
+import argparse
+import collections
+import contextlib
+import json
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+import traceback
+import urllib.request
+from typing import Any
+
+from concoursetools import BuildMetadata
+
+from concourse import ConcourseGithubIssuesResource
+from github_stub import GithubStub
+
+REPOSITORY = "soak/fleet"
+STEPS = ("out", "check", "in")
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, round(fraction * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def close_issue(stub_url: str, token: str, issue_number: int):
+    """Close an issue the way a person would, outside of any resource step."""
+    request = urllib.request.Request(
+        f"{stub_url}/repos/{REPOSITORY}/issues/{issue_number}",
+        data=json.dumps({"state": "closed"}).encode(),
+        headers={"Authorization": token, "Content-Type": "application/json"},
+        method="PATCH",
+    )
+    with urllib.request.urlopen(request) as response:
+        response.read()
+
+
+class SimulatedPipeline:
+    """One pipeline's resource configuration plus the bookkeeping of its run."""
+
+    def __init__(self, worker_id: int, config: dict[str, Any], stub_url: str):
+        self.worker_id = worker_id
+        self.config = config
+        self.stub_url = stub_url
+        self.random = random.Random(config["seed"] + worker_id)
+        self.token = f"token token-{worker_id % config['tokens']}"
+        self.pipeline_name = f"pipeline-{worker_id}"
+        self.source = {
+            "repository": REPOSITORY,
+            "access_token": self.token.split(" ", 1)[1],
+            "gh_host": stub_url,
+            # The trailing " task" keeps pipeline-1 from matching pipeline-10
+            "issue_prefix": f"[bot] Pipeline {self.pipeline_name} task",
+            "raw_issue_listing": config["raw_issue_listing"],
+        }
+        self.latencies: dict[str, list[float]] = {step: [] for step in STEPS}
+        self.errors: collections.Counter[str] = collections.Counter()
+        self.closed_issues: set[int] = set()
+        self.emitted_issues: list[int] = []
+        self.previous_version = None
+
+    def build_metadata(self, build: int) -> BuildMetadata:
+        return BuildMetadata(
+            BUILD_ID=f"{self.worker_id}{build:06d}",
+            BUILD_TEAM_NAME="main",
+            ATC_EXTERNAL_URL="http://concourse.example.com",
+            BUILD_NAME=str(build),
+            BUILD_JOB_NAME="deploy",
+            BUILD_PIPELINE_NAME=self.pipeline_name,
+        )
+
+    def timed(self, step: str, func, *args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        except BaseException as exc:
+            # The resource exits when the rate limit is exhausted
+            if not isinstance(exc, (Exception, SystemExit)):
+                raise
+            self.errors[f"{step}:{type(exc).__name__}"] += 1
+            if self.config["verbose"]:
+                traceback.print_exc()
+            return None
+        finally:
+            self.latencies[step].append((time.perf_counter() - started) * 1000)
+
+    def put(self, build: int):
+        resource = ConcourseGithubIssuesResource(**self.source, issue_state="open")
+        version, _ = resource.publish_new_version(
+            sources_dir=None, build_metadata=self.build_metadata(build)
+        )
+        return version
+
+    def check(self):
+        resource = ConcourseGithubIssuesResource(**self.source, issue_state="closed")
+        return resource.fetch_new_versions(self.previous_version)
+
+    def get(self, version, build: int):
+        resource = ConcourseGithubIssuesResource(**self.source, issue_state="closed")
+        with tempfile.TemporaryDirectory() as destination_dir:
+            resource.download_version(
+                version, destination_dir, self.build_metadata(build)
+            )
+
+    def check_and_get(self, build: int):
+        versions = self.timed("check", self.check)
+        if not versions:
+            return
+        self.emitted_issues.extend(int(version.issue_number) for version in versions)
+        self.previous_version = max(versions)
+        for version in sorted(versions):
+            self.timed("in", self.get, version, build)
+
+    def run(self) -> dict[str, Any]:
+        interval = self.config["interval"]
+        next_cycle = time.monotonic() + self.random.uniform(0, interval)
+        for build in range(1, self.config["cycles"] + 1):
+            time.sleep(max(0.0, next_cycle - time.monotonic()))
+            next_cycle += interval * self.random.uniform(0.8, 1.2)
+
+            version = self.timed("out", self.put, build)
+            if version and self.random.random() < self.config["close_probability"]:
+                try:
+                    # People close issues with their own token, not the fleet's
+                    close_issue(
+                        self.stub_url,
+                        f"token human-{self.worker_id}",
+                        int(version.issue_number),
+                    )
+                except OSError as exc:
+                    self.errors[f"close:{type(exc).__name__}"] += 1
+                else:
+                    self.closed_issues.add(int(version.issue_number))
+            self.check_and_get(build)
+
+        # Let search and listing settle, then pick up anything still outstanding
+        time.sleep(self.config["search_lag"])
+        self.check_and_get(self.config["cycles"] + 1)
+        return {
+            "worker_id": self.worker_id,
+            "latencies": self.latencies,
+            "errors": dict(self.errors),
+            "closed_issues": sorted(self.closed_issues),
+            "emitted_issues": self.emitted_issues,
+        }
+
+
+def run_worker(worker_id: int, config: dict[str, Any], stub_url: str, results):
+    try:
+        # The resource prints progress to stdout; keep stdout for the report
+        with contextlib.redirect_stdout(sys.stderr):
+            results.put(SimulatedPipeline(worker_id, config, stub_url).run())
+    except Exception:
+        results.put({"worker_id": worker_id, "crash": traceback.format_exc()})
+
+
+def build_report(
+    config: dict[str, Any],
+    worker_results: list[dict[str, Any]],
+    stub: GithubStub,
+    duration: float,
+) -> dict[str, Any]:
+    latencies: dict[str, list[float]] = {step: [] for step in STEPS}
+    errors: collections.Counter[str] = collections.Counter()
+    missed: list[int] = []
+    duplicated: list[int] = []
+    closed_total = emitted_total = 0
+    for result in worker_results:
+        if "crash" in result:
+            errors["worker:crash"] += 1
+            continue
+        for step in STEPS:
+            latencies[step].extend(result["latencies"][step])
+        errors.update(result["errors"])
+        emitted = collections.Counter(result["emitted_issues"])
+        closed = set(result["closed_issues"])
+        closed_total += len(closed)
+        emitted_total += len(emitted)
+        missed.extend(sorted(closed - set(emitted)))
+        duplicated.extend(number for number, count in emitted.items() if count > 1)
+
+    total_steps = sum(len(values) for values in latencies.values())
+    return {
+        "config": config,
+        "duration_seconds": round(duration, 3),
+        "throughput_steps_per_second": round(total_steps / duration, 3),
+        "steps": {
+            step: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 0.50), 1),
+                "p99_ms": round(percentile(values, 0.99), 1),
+            }
+            for step, values in latencies.items()
+        },
+        "errors": dict(errors),
+        "duplicate_issue_incidents": stub.stats["duplicate_issues"],
+        "versions": {
+            "closed": closed_total,
+            "emitted": emitted_total,
+            "missed": len(missed),
+            "duplicated": len(duplicated),
+            "missed_issue_numbers": missed,
+            "duplicated_issue_numbers": duplicated,
+        },
+        "stub": dict(stub.stats),
+        "crashes": [result["crash"] for result in worker_results if "crash" in result],
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=10)
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=2.0)
+    parser.add_argument("--close-probability", type=float, default=0.7)
+    parser.add_argument(
+        "--tokens", type=int, default=1, help="distinct tokens shared by the fleet"
+    )
+    parser.add_argument("--raw-issue-listing", action="store_true")
+    parser.add_argument("--latency-median-ms", type=float, default=50.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--core-limit", type=int, default=5000)
+    parser.add_argument("--rate-window", type=float, default=3600.0)
+    parser.add_argument("--search-limit", type=int, default=30)
+    parser.add_argument("--secondary-write-limit", type=int, default=None)
+    parser.add_argument("--secondary-window", type=float, default=1.0)
+    parser.add_argument("--search-lag", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here, not stdout")
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    config = vars(args)
+    stub = GithubStub(
+        latency_median_ms=args.latency_median_ms,
+        latency_sigma=args.latency_sigma,
+        core_limit=args.core_limit,
+        rate_window=args.rate_window,
+        search_limit=args.search_limit,
+        secondary_write_limit=args.secondary_write_limit,
+        secondary_window=args.secondary_window,
+        search_lag=args.search_lag,
+        seed=args.seed,
+    )
+    stub.start()
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    started = time.perf_counter()
+    workers = [
+        context.Process(target=run_worker, args=(worker_id, config, stub.url, results))
+        for worker_id in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    # Drain results before joining so no worker blocks on a full queue
+    worker_results = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    duration = time.perf_counter() - started
+    stub.stop()
+
+    report = json.dumps(build_report(config, worker_results, stub, duration), indent=2)
+    if args.output:
+        with open(args.output, "w") as report_file:
+            report_file.write(report + "\n")
+    else:
+        print(report)
+    if any("crash" in result for result in worker_results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,25 @@
+import io
+import json
+import os
+import pstats
+import re
+import socket
+import sys
+import threading
+from typing import Any
 from github.GithubObject import NotSet
 import pytest
 from unittest.mock import MagicMock, patch
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from concourse import (
+    CompiledTemplate,
     ConcourseGithubIssuesResource,
     ConcourseGithubIssuesVersion,
     ISO_8601_FORMAT,
+    ResourceDaemon,
+    build_metadata_dict,
+    profile_category_times,
 )
 from concoursetools import BuildMetadata  # Import the actual class
 from concoursetools.testing import SimpleTestResourceWrapper
@@ -125,7 +138,7 @@ def mock_github():
         mock_gh_instance.get_repo.return_value = mock_repo
         # Set a default rate limit mock to avoid errors
         mock_rate_limit = MagicMock()
-        mock_rate_limit.core.remaining = 5000
+        mock_rate_limit.resources.core.remaining = 5000
         mock_gh_instance.get_rate_limit.return_value = mock_rate_limit
         yield mock_gh_instance, mock_repo
 
@@ -516,3 +529,551 @@ def test_publish_new_version_comments_on_existing(mock_github):
     assert version.issue_title == expected_title
     assert version.issue_state == "open"
     assert metadata == {}
+
+
+def test_publish_new_version_rolling_creates_status_comment(mock_github):
+    """Test rolling mode creates a status comment and stamps its id on the issue."""
+    mock_gh_instance, mock_repo = mock_github
+    existing_mock_issue = create_mock_issue(
+        number=9,
+        title="[bot] Pipeline my-pipeline task my-job completed",
+        state="open",
+        created_at=T_MINUS_1,
+    )
+    existing_mock_issue.body = "Original body"
+    existing_mock_issue.create_comment.return_value = MagicMock(id=555)
+    mock_gh_instance.search_issues.return_value = [existing_mock_issue]
+
+    resource = ConcourseGithubIssuesResource(
+        repository="test/repo",
+        access_token="dummy_token",
+        issue_state="open",
+        issue_body_template="Build {BUILD_NAME} finished.",
+        comment_mode="rolling",
+    )
+    build_meta = mock_build_metadata(
+        pipeline_name="my-pipeline", job_name="my-job", build_name="7"
+    )
+
+    resource.publish_new_version(sources_dir="dummy", build_metadata=build_meta)
+
+    existing_mock_issue.get_comment.assert_not_called()
+    existing_mock_issue.create_comment.assert_called_once()
+    status_body = existing_mock_issue.create_comment.call_args.args[0]
+    assert "Build 7 finished." in status_body
+    assert "| 7 | my-job |" in status_body
+    existing_mock_issue.edit.assert_called_once_with(
+        body="Original body\n\n<!-- concourse-github-issues:status-comment-id=555 -->"
+    )
+    assert resource.status_comment_ids == {9: 555}
+
+
+def test_publish_new_version_rolling_edits_status_comment(mock_github):
+    """Test rolling mode edits the cached status comment with bounded history."""
+    mock_gh_instance, mock_repo = mock_github
+    existing_mock_issue = create_mock_issue(
+        number=9,
+        title="[bot] Pipeline my-pipeline task my-job completed",
+        state="open",
+        created_at=T_MINUS_1,
+    )
+    existing_mock_issue.body = (
+        "Body\n\n<!-- concourse-github-issues:status-comment-id=555 -->"
+    )
+    status_comment = MagicMock(id=555)
+    existing_mock_issue.get_comment.return_value = status_comment
+    mock_gh_instance.search_issues.return_value = [existing_mock_issue]
+
+    resource = ConcourseGithubIssuesResource(
+        repository="test/repo",
+        access_token="dummy_token",
+        issue_state="open",
+        issue_body_template="Build {BUILD_NAME} finished.",
+        comment_mode="rolling",
+        comment_history_size=2,
+        comment_append_every=3,
+    )
+
+    status_comment.body = ""
+    for build_name in ["1", "2", "3"]:
+        resource.publish_new_version(
+            sources_dir="dummy",
+            build_metadata=mock_build_metadata(build_name=build_name),
+        )
+        status_comment.body = status_comment.edit.call_args.args[0]
+
+    existing_mock_issue.get_comment.assert_called_with(555)
+    existing_mock_issue.edit.assert_not_called()
+    # Only the every-N append creates a comment; the status comment is edited
+    existing_mock_issue.create_comment.assert_called_once_with("Build 3 finished.")
+    assert status_comment.edit.call_count == 3
+    assert "| 3 | test-job |" in status_comment.body
+    assert "| 2 | test-job |" in status_comment.body
+    assert "| 1 | test-job |" not in status_comment.body
+    assert "builds_since_append=0" in status_comment.body
+
+
+def test_download_version_profiling_writes_stats(mock_github, tmp_path, capsys):
+    """Test that enabling profiling dumps pstats into the output dir."""
+    mock_gh_instance, mock_repo = mock_github
+    resource = ConcourseGithubIssuesResource(
+        repository="test/repo",
+        access_token="dummy_token",
+        issue_state="open",
+        profile=True,
+        profile_top_n=5,
+    )
+    version_to_download = ConcourseGithubIssuesVersion(
+        issue_number=3,
+        issue_title="[bot] Issue 3",
+        issue_state="open",
+        issue_created_at=T_MINUS_1.strftime(ISO_8601_FORMAT),
+        issue_closed_at=None,
+        issue_url="http://example.com/issue/3",
+    )
+
+    returned_version, _ = resource.download_version(
+        version_to_download, str(tmp_path), mock_build_metadata()
+    )
+
+    assert returned_version == version_to_download
+    assert (tmp_path / "gh_issue.json").exists()
+    assert (tmp_path / "download_version.pstats").exists()
+    summary = (tmp_path / "download_version.profile.txt").read_text()
+    assert "=== profile: download_version ===" in summary
+    assert "peak traced memory" in summary
+    assert "=== profile: download_version ===" in capsys.readouterr().err
+
+
+def test_profiling_enabled_from_environment(mock_github, monkeypatch):
+    """Test that the profiling switch can be flipped from the environment."""
+    monkeypatch.setenv("CONCOURSE_GITHUB_ISSUES_PROFILE", "true")
+    resource = ConcourseGithubIssuesResource(
+        repository="test/repo", access_token="dummy_token"
+    )
+    assert resource.profile is True
+
+
+def test_profile_category_times_charges_builtins_to_callers():
+    """Test that builtin waits are charged to the category of their callers."""
+    requester = ("/site-packages/github/Requester.py", 500, "__deferRequest")
+    resource_code = ("/app/concourse.py", 10, "fetch_new_versions")
+    sleep = ("~", 0, "<built-in method time.sleep>")
+    lock = ("~", 0, "<method 'acquire' of '_thread.lock' objects>")
+    ssl_read = ("~", 0, "<method 'recv_into' of '_ssl._SSLSocket' objects>")
+    sleep_callers = {requester: (1, 1, 0.48, 0.48), resource_code: (1, 1, 0.02, 0.02)}
+    # (cc, nc, tottime, cumtime, callers), as cProfile records them
+    stats = pstats.Stats()
+    stats.stats = {  # type: ignore[attr-defined]
+        requester: (1, 1, 0.01, 0.49, {}),
+        resource_code: (1, 1, 0.05, 0.7, {}),
+        sleep: (2, 2, 0.5, 0.5, sleep_callers),
+        lock: (1, 1, 0.1, 0.1, {}),
+        ssl_read: (1, 1, 0.2, 0.2, {requester: (1, 1, 0.2, 0.2)}),
+    }
+
+    category_times = profile_category_times(stats)
+
+    assert category_times == pytest.approx(
+        {"pygithub": 0.49, "resource": 0.07, "network": 0.2, "other": 0.1}
+    )
+
+
+def issue_json(
+    number: int, title: str, state: str, closed_at: str | None
+) -> dict[str, Any]:
+    return {
+        "number": number,
+        "title": title,
+        "state": state,
+        "created_at": "2024-01-01T00:00:00Z",
+        "closed_at": closed_at,
+        "url": f"https://api.github.com/repos/test/repo/issues/{number}",
+        "user": {"login": "bot"},
+        "labels": [{"name": "pipeline"}],
+    }
+
+
+def test_fetch_new_versions_raw_issue_listing(mock_github):
+    """Test the raw JSON listing path follows pagination and filters by prefix."""
+    mock_gh_instance, mock_repo = mock_github
+    mock_repo.url = "https://api.github.com/repos/test/repo"
+    first_page = [
+        issue_json(7, "[bot] Issue 7", "closed", "2024-01-03T00:00:00Z"),
+        issue_json(6, "User Issue 6", "closed", "2024-01-02T00:00:00Z"),
+    ]
+    second_page = [issue_json(5, "[bot] Issue 5", "closed", "2024-01-02T00:00:00Z")]
+    next_url = "https://api.github.com/repositories/1/issues?state=closed&page=2"
+    mock_gh_instance.requester.requestJson.side_effect = [
+        (200, {"link": f'<{next_url}>; rel="next"'}, json.dumps(first_page)),
+        (200, {}, json.dumps(second_page)),
+    ]
+
+    resource = ConcourseGithubIssuesResource(
+        repository="test/repo",
+        access_token="dummy_token",
+        issue_state="closed",
+        issue_prefix="[bot]",
+        labels=["pipeline"],
+        raw_issue_listing=True,
+    )
+    wrapper = SimpleTestResourceWrapper(resource)
+
+    versions = wrapper.fetch_new_versions(None)
+
+    assert {v.issue_number for v in versions} == {5, 7}
+    assert {v.issue_closed_at for v in versions} == {
+        "2024-01-02T00:00:00",
+        "2024-01-03T00:00:00",
+    }
+    mock_repo.get_issues.assert_not_called()
+    first_call, second_call = mock_gh_instance.requester.requestJson.call_args_list
+    assert first_call.args == ("GET", "https://api.github.com/repos/test/repo/issues")
+    assert first_call.kwargs == {
+        "parameters": {"state": "closed", "per_page": 100, "labels": "pipeline"}
+    }
+    assert second_call.args == ("GET", next_url)
+    assert second_call.kwargs == {"parameters": None}
+
+
+@pytest.fixture
+def resource_daemon(tmp_path, monkeypatch):
+    """Run a ResourceDaemon in a background thread and point clients at it."""
+    socket_path = str(tmp_path / "daemon.sock")
+    daemon = ResourceDaemon(socket_path)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("CONCOURSE_GITHUB_ISSUES_DAEMON_SOCKET", socket_path)
+    yield daemon
+    daemon.shutdown()
+    daemon.server_close()
+
+
+def test_check_main_forwards_to_daemon(
+    mock_github, resource_daemon, monkeypatch, capsys
+):
+    """Test check is served by the daemon, which reuses its warm resource."""
+    mock_gh_instance, mock_repo = mock_github
+    mock_repo.get_issues.return_value = [
+        issue for issue in MOCK_ISSUES if issue.state == "closed"
+    ]
+    payload = json.dumps(
+        {
+            "source": {
+                "repository": "test/repo",
+                "access_token": "dummy_token",
+                "issue_prefix": "[bot]",
+            }
+        }
+    )
+
+    for _ in range(2):
+        monkeypatch.setattr("sys.stdin", io.StringIO(payload))
+        ConcourseGithubIssuesResource.check_main()
+        output = json.loads(capsys.readouterr().out)
+        assert [version["issue_number"] for version in output] == ["1"]
+
+    assert len(resource_daemon.resource_cache) == 1
+    mock_gh_instance.get_repo.assert_called_once_with("test/repo")
+    assert mock_repo.get_issues.call_count == 2
+    assert ConcourseGithubIssuesResource.resource_cache is None
+
+
+def test_check_main_falls_back_without_daemon(
+    mock_github, tmp_path, monkeypatch, capsys
+):
+    """Test check runs in-process when the daemon socket is unreachable."""
+    mock_gh_instance, mock_repo = mock_github
+    mock_repo.get_issues.return_value = []
+    monkeypatch.setenv(
+        "CONCOURSE_GITHUB_ISSUES_DAEMON_SOCKET", str(tmp_path / "missing.sock")
+    )
+    payload = json.dumps(
+        {"source": {"repository": "test/repo", "access_token": "dummy_token"}}
+    )
+    monkeypatch.setattr("sys.stdin", io.StringIO(payload))
+
+    ConcourseGithubIssuesResource.check_main()
+
+    captured = capsys.readouterr()
+    assert json.loads(captured.out) == []
+    assert "running in-process" in captured.err
+
+
+def test_daemon_socket_is_private(resource_daemon):
+    """Test only the daemon's user can connect to its socket."""
+    assert os.stat(resource_daemon.socket_path).st_mode & 0o777 == 0o600
+
+
+@pytest.mark.parametrize(
+    "exit_code, expected_code, expected_stderr",
+    [(None, 0, ""), (3, 3, ""), ("bad source", 1, "bad source\n")],
+)
+def test_daemon_maps_step_exit_codes(
+    resource_daemon, monkeypatch, exit_code, expected_code, expected_stderr
+):
+    """Test sys.exit() inside a step is reported the way the interpreter would."""
+
+    def exiting_step():
+        sys.exit(exit_code)
+
+    monkeypatch.setattr(ConcourseGithubIssuesResource, "check_main", exiting_step)
+
+    response = resource_daemon.run_step("check", "{}", [], {})
+
+    assert response["exit_code"] == expected_code
+    assert response["stderr"] == expected_stderr
+
+
+def test_check_main_fails_when_daemon_times_out(tmp_path, monkeypatch):
+    """Test a step fails, rather than hangs, when the daemon never answers."""
+    socket_path = str(tmp_path / "stuck.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stuck_daemon:
+        # Connections queue in the backlog but are never accepted or answered
+        stuck_daemon.bind(socket_path)
+        stuck_daemon.listen()
+        monkeypatch.setenv("CONCOURSE_GITHUB_ISSUES_DAEMON_SOCKET", socket_path)
+        monkeypatch.setenv("CONCOURSE_GITHUB_ISSUES_DAEMON_TIMEOUT", "0.1")
+        monkeypatch.setattr("sys.stdin", io.StringIO("{}"))
+
+        with pytest.raises(SystemExit, match="did not finish the check step"):
+            ConcourseGithubIssuesResource.check_main()
+
+
+class FakeSearchResults:
+    """Stands in for PyGithub's PaginatedList of search results.
+
+    Like the real one, totalCount is only known once a page has been fetched;
+    every page fetched is recorded in ``requested_pages``.
+    """
+
+    def __init__(self, issues: list[Issue], per_page: int, requested_pages: list[int]):
+        self.issues = issues
+        self.per_page = per_page
+        self.requested_pages = requested_pages
+        self.total_count: int | None = None
+
+    def get_page(self, page: int) -> list[Issue]:
+        self.requested_pages.append(page)
+        self.total_count = len(self.issues)
+        return self.issues[page * self.per_page : (page + 1) * self.per_page]
+
+    @property
+    def totalCount(self) -> int:
+        assert self.total_count is not None, "totalCount would cost a request"
+        return self.total_count
+
+
+@pytest.fixture
+def unpaced_search(monkeypatch):
+    """Lift the search pacing for backfills that span years of windows."""
+    monkeypatch.setattr("concourse.SEARCH_REQUESTS_PER_MINUTE", 10_000)
+
+
+def closed_window_search(issues, per_page=100, requested_pages=None):
+    """Build a search_issues side effect that filters issues by closed:START..END."""
+
+    def search_issues(query):
+        window = re.search(r"closed:(\S+)\.\.(\S+)", query)
+        assert window is not None
+        start, end = (
+            datetime.strptime(bound, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+            for bound in window.groups()
+        )
+        return FakeSearchResults(
+            [issue for issue in issues if start <= issue.closed_at <= end],
+            per_page,
+            requested_pages if requested_pages is not None else [],
+        )
+
+    return search_issues
+
+
+BACKFILL_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+BACKFILL_ISSUES = [
+    create_mock_issue(
+        number=number,
+        title=f"[bot] Issue {number}",
+        state="closed",
+        created_at=BACKFILL_START,
+        closed_at=BACKFILL_START + timedelta(days=days_to_close),
+    )
+    # Issue numbers deliberately do not follow closing order
+    for number, days_to_close in [(1, 50), (2, 5), (3, 25), (4, 12)]
+] + [
+    create_mock_issue(
+        number=5,
+        title="User mentions [bot] in title",
+        state="closed",
+        created_at=BACKFILL_START,
+        closed_at=BACKFILL_START + timedelta(days=3),
+    )
+]
+
+
+def test_fetch_new_versions_backfill_orders_by_closed_at(mock_github, tmp_path, unpaced_search):
+    """Test backfill searches closed_at windows and emits versions by closed_at."""
+    mock_gh_instance, mock_repo = mock_github
+    mock_repo.created_at = BACKFILL_START
+    mock_gh_instance.search_issues.side_effect = closed_window_search(BACKFILL_ISSUES)
+    checkpoint_path = tmp_path / "checkpoint.json"
+
+    resource = ConcourseGithubIssuesResource(
+        repository="test/repo",
+        access_token="dummy_token",
+        issue_state="closed",
+        issue_prefix="[bot]",
+        labels=["pipeline"],
+        backfill=True,
+        backfill_window_days=10,
+        backfill_checkpoint_path=str(checkpoint_path),
+    )
+
+    versions = resource.fetch_new_versions(None)
+
+    assert [version.issue_number for version in versions] == [2, 4, 3, 1]
+    mock_repo.get_issues.assert_not_called()
+    first_query = mock_gh_instance.search_issues.call_args_list[0].args[0]
+    assert first_query == (
+        "repo:test/repo is:issue state:closed "
+        "closed:2024-01-01T00:00:00Z..2024-01-10T23:59:59Z "
+        'label:"pipeline" "[bot]" in:title'
+    )
+    assert not checkpoint_path.exists()
+
+
+def test_fetch_new_versions_backfill_resumes_from_checkpoint(mock_github, tmp_path, unpaced_search):
+    """Test an interrupted backfill resumes after the last completed window."""
+    mock_gh_instance, mock_repo = mock_github
+    mock_repo.created_at = BACKFILL_START
+    mock_gh_instance.search_issues.side_effect = closed_window_search(BACKFILL_ISSUES)
+    checkpoint_path = tmp_path / "checkpoint.json"
+    completed_version = ConcourseGithubIssuesVersion(
+        issue_number=2,
+        issue_title="[bot] Issue 2",
+        issue_state="closed",
+        issue_created_at=BACKFILL_START.strftime(ISO_8601_FORMAT),
+        issue_closed_at=(BACKFILL_START + timedelta(days=5)).strftime(ISO_8601_FORMAT),
+        issue_url="http://example.com/issue",
+    )
+    checkpoint_path.write_text(
+        json.dumps(
+            {
+                "completed_until": "2024-01-20T23:59:59Z",
+                "versions": [completed_version.to_flat_dict()],
+            }
+        )
+    )
+
+    resource = ConcourseGithubIssuesResource(
+        repository="test/repo",
+        access_token="dummy_token",
+        issue_state="closed",
+        issue_prefix="[bot]",
+        backfill=True,
+        backfill_window_days=10,
+        backfill_checkpoint_path=str(checkpoint_path),
+    )
+
+    versions = resource.fetch_new_versions(None)
+
+    # Issue 4 closed inside an already completed window, so it is not refetched
+    assert [int(version.issue_number) for version in versions] == [2, 3, 1]
+    first_query = mock_gh_instance.search_issues.call_args_list[0].args[0]
+    assert "closed:2024-01-21T00:00:00Z..2024-01-30T23:59:59Z" in first_query
+    assert not checkpoint_path.exists()
+
+
+def test_backfill_splits_and_pages_without_extra_requests(
+    mock_github, tmp_path, monkeypatch
+):
+    """Test oversized windows are split and every search page is fetched once."""
+    mock_gh_instance, mock_repo = mock_github
+    mock_repo.created_at = BACKFILL_START
+    requested_pages: list[int] = []
+    mock_gh_instance.search_issues.side_effect = closed_window_search(
+        BACKFILL_ISSUES, per_page=1, requested_pages=requested_pages
+    )
+    monkeypatch.setattr("concourse.SEARCH_RESULT_LIMIT", 2)
+
+    resource = ConcourseGithubIssuesResource(
+        repository="test/repo",
+        access_token="dummy_token",
+        issue_state="closed",
+        issue_prefix="[bot]",
+        backfill=True,
+        backfill_start="2024-01-01T00:00:00",
+        backfill_window_days=30,
+        backfill_checkpoint_path=str(tmp_path / "checkpoint.json"),
+    )
+    resource.search_closed_window = MagicMock(wraps=resource.search_closed_window)
+
+    versions = resource.search_closed_window(
+        BACKFILL_START, BACKFILL_START + timedelta(days=29)
+    )
+
+    # Issues 5, 2, 4 and 3 closed in the first 30 days: too many for one search
+    assert [version.issue_number for version in versions] == [2, 4, 3]
+    assert resource.search_closed_window.call_count == 3
+    # One page for the oversized window, then both pages of each half
+    assert requested_pages == [0, 0, 1, 0, 1]
+    assert len(resource.search_request_times) == len(requested_pages)
+
+
+def test_compiled_template_renders_and_parses():
+    """Test a compiled template renders like str.format and parses back."""
+    template = "[bot] {BUILD_PIPELINE_NAME}/{BUILD_JOB_NAME} #{BUILD_NAME}"
+    compiled = CompiledTemplate(template)
+    values = build_metadata_dict(mock_build_metadata())
+
+    rendered = compiled.render(values)
+
+    assert rendered == template.format(**values)
+    assert compiled.parse(rendered) == {
+        "BUILD_PIPELINE_NAME": "test-pipeline",
+        "BUILD_JOB_NAME": "test-job",
+        "BUILD_NAME": "42",
+    }
+    assert compiled.parse(f"[CONSUMED #42]{rendered}") is None
+
+
+def test_unknown_template_placeholder_fails_at_construction(mock_github):
+    """Test a bad placeholder is reported before any API call is made."""
+    with pytest.raises(ValueError, match="BUILD_NUMBER"):
+        ConcourseGithubIssuesResource(
+            repository="test/repo",
+            access_token="dummy_token",
+            issue_title_template="[bot] {BUILD_PIPELINE_NAME} #{BUILD_NUMBER}",
+        )
+
+
+def test_fetch_new_versions_match_title_template(mock_github):
+    """Test match_title_template only selects titles the template could render."""
+    mock_gh_instance, mock_repo = mock_github
+    mock_repo.get_issues.return_value = [
+        create_mock_issue(
+            number=number,
+            title=title,
+            state="closed",
+            created_at=T_MINUS_2,
+            closed_at=T_MINUS_1,
+        )
+        for number, title in [
+            (1, "[bot] Pipeline deploy task release completed"),
+            (2, "[bot] Pipeline deploy failed, please look"),
+            (3, "[CONSUMED #7][bot] Pipeline deploy task release completed"),
+        ]
+    ]
+
+    resource = ConcourseGithubIssuesResource(
+        repository="test/repo",
+        access_token="dummy_token",
+        issue_state="closed",
+        issue_prefix="[bot]",
+        match_title_template=True,
+    )
+    wrapper = SimpleTestResourceWrapper(resource)
+
+    versions = wrapper.fetch_new_versions(None)
+
+    assert {v.issue_number for v in versions} == {1}